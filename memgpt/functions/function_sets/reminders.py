@@ -1,24 +1,17 @@
-import os
-import shelve
 import datetime
-import math
 from typing import Optional
 from memgpt.agent import Agent
-from dateutil.rrule import rrulestr
-import requests
-import pytz
-from memgpt.scheduler import get_scheduler
-
-BASE_URL = "http://localhost:8083/api"
-MEMGPT_SERVER_PASS = os.environ["MEMGPT_SERVER_PASS"]
-
-DEFAULT_HEADERS = {
-    "Accept": "application/json",
-    "Content-Type": "application/json",
-    "Authorization": f"Bearer {MEMGPT_SERVER_PASS}",
-}
-
-SAO_PAULO_TIMEZONE = pytz.timezone('America/Sao_Paulo')
+from memgpt.reminders import (
+    SAO_PAULO_TIMEZONE,
+    add_reminder,
+    add_reminders,
+    get_next_occurrence,
+    get_reminder,
+    get_reminders_page,
+    remove_reminder,
+    schedule_reminder,
+    unschedule_reminder,
+)
 
 
 def create_reminder(
@@ -55,87 +48,80 @@ def create_reminder(
     Returns:
         str: A message indicating that the reminder has been added.
     """
-    with shelve.open("reminders.shelve") as db:
-        # Check for existing reminders with the same description for the current agent
-        agent_reminders = [reminder for reminder in db.values() if reminder["agent_id"] == self.agent_state.id]
-        for reminder in agent_reminders:
-            if reminder["description"] == description:
-                return f"Reminder with description '{description}' already exists."
-
-        # Determine the new reminder ID
-        if agent_reminders:
-            last_id = max(reminder["id"] for reminder in agent_reminders)
-        else:
-            last_id = 0
-        new_id = last_id + 1
-
-        current_time = datetime.datetime.now(SAO_PAULO_TIMEZONE)
-        reminder = {
-            "id": new_id,
-            "agent_id": self.agent_state.id,
-            "description": description,
-            "recurrence_rule": recurrence_rule,
-            "created_at": current_time.isoformat(),
-            "modified_at": current_time.isoformat(),
-        }
-        db[str(new_id)] = reminder
-
-    # Define the send_message function inside create_reminder
-    def send_message(agent_id: str, message: str):
-        url = f"{BASE_URL}/agents/{agent_id}/messages"
-        payload = { "message": message }
-        print(f"Sending message to {url} with payload: {payload}")
-        response = requests.post(url, json=payload, headers=DEFAULT_HEADERS)
-        print(f"Message sent with response status: {response.status_code}")
-        return response
-
-    # Define the scheduling function inside create_reminder
-    def schedule_reminder(reminder_id: int, description: str, recurrence_rule: Optional[str], timestamp: Optional[str], delay_minutes: Optional[int]):
-        print(f"Scheduling reminder with ID {reminder_id} and description '{description}'")
-        
-        if recurrence_rule:
-            rule = rrulestr(recurrence_rule, dtstart=current_time)
-            next_occurrence = rule.after(current_time)
-        elif timestamp:
-            next_occurrence = datetime.datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").replace(tzinfo=SAO_PAULO_TIMEZONE)
-        elif delay_minutes:
-            next_occurrence = current_time + datetime.timedelta(minutes=delay_minutes)
-        else:
-            raise ValueError("Either recurrence_rule, timestamp or delay_minutes must be provided")
-        
-        print(f"Next occurrence calculated: {next_occurrence}")
-
-        def execute_reminder():
-            current_time_str = datetime.datetime.now(SAO_PAULO_TIMEZONE).strftime('%Y-%m-%d %H:%M:%S')
-            message = f"> SYS: It is {current_time_str}, remind the user about his scheduled reminder: '{description}'"
-            print(f"Executing reminder ID {reminder_id} at {current_time_str}")
-            response = send_message(self.agent_state.id, message)
-            print(f"Message sent with response status: {response.status_code}")
-            
-            # Schedule the next occurrence if there is a recurrence rule
-            if recurrence_rule:
-                next_occurrence = rule.after(datetime.datetime.now(SAO_PAULO_TIMEZONE))
-                if next_occurrence:
-                    print(f"Scheduling next occurrence for reminder ID {reminder_id} at {next_occurrence}")
-                    scheduler = get_scheduler()
-                    scheduler.add_job(execute_reminder, 'date', run_date=next_occurrence, id=f"reminder_{reminder_id}")
-                else:
-                    # If there is no next occurrence, delete the reminder from the database
-                    with shelve.open("reminders.shelve") as db:
-                        if str(reminder_id) in db:
-                            del db[str(reminder_id)]
-                            print(f"Reminder ID {reminder_id} deleted from the database as there are no more occurrences.")
-        
-        scheduler = get_scheduler()
-        scheduler.add_job(execute_reminder, 'date', run_date=next_occurrence, id=f"reminder_{reminder_id}")
-        return next_occurrence
+    current_time = datetime.datetime.now(SAO_PAULO_TIMEZONE)
+    # Reject bad timing before anything is stored, so a failed call leaves no reminder behind
+    get_next_occurrence(recurrence_rule, timestamp, delay_minutes, current_time)
+    new_id = add_reminder(self.agent_state.id, description, recurrence_rule, current_time.isoformat())
+    # No ID means the current agent already has a reminder with the same description
+    if new_id is None:
+        return f"Reminder with description '{description}' already exists."
 
     # Schedule the reminder and get the next occurrence
-    next_occurrence = schedule_reminder(new_id, description, recurrence_rule, timestamp, delay_minutes)
+    try:
+        next_occurrence = schedule_reminder(self.agent_state.id, new_id, description, recurrence_rule, timestamp, delay_minutes, current_time)
+    except Exception as e:
+        # Drop the stored row so the description is not blocked by a reminder that will never fire
+        remove_reminder(self.agent_state.id, new_id)
+        return f"Reminder '{description}' could not be scheduled: {e}"
 
     return f"Reminder '{description}' has been added. Next occurrence: {next_occurrence}"
 
 
+def create_reminders_batch(self: Agent, items: list[dict]) -> str:
+    """
+    Creates several reminders at once. Use this instead of calling create_reminder repeatedly when the user asks for more than one reminder.
+
+    Args:
+        items (list[dict]): The reminders to create. Each item is an object with a "description" (str, required) and at least one of "recurrence_rule" (str), "timestamp" (str, "YYYY-MM-DD HH:mm:ss") or "delay_minutes" (int), following the same rules as create_reminder.
+
+    Returns:
+        str: One line per item, in input order, with the ID of the new reminder or the reason it was not added.
+    """
+    current_time = datetime.datetime.now(SAO_PAULO_TIMEZONE)
+    results = [None] * len(items)
+    valid_items = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get("description"):
+            results[i] = f"Item {i}: a description is required."
+            continue
+        # Timing is checked before anything is stored, so one bad item cannot leave reminders without a job behind
+        try:
+            get_next_occurrence(item.get("recurrence_rule"), item.get("timestamp"), item.get("delay_minutes"), current_time)
+        except ValueError as e:
+            results[i] = f"Item {i}: {e}."
+            continue
+        valid_items.append((i, item))
+
+    # Insert every reminder in a single transaction, then schedule them
+    new_ids = add_reminders(
+        self.agent_state.id,
+        [(item["description"], item.get("recurrence_rule")) for _, item in valid_items],
+        current_time.isoformat(),
+    )
+    for (i, item), new_id in zip(valid_items, new_ids):
+        if new_id is None:
+            results[i] = f"Item {i}: reminder with description '{item['description']}' already exists."
+            continue
+        try:
+            next_occurrence = schedule_reminder(
+                self.agent_state.id,
+                new_id,
+                item["description"],
+                item.get("recurrence_rule"),
+                item.get("timestamp"),
+                item.get("delay_minutes"),
+                current_time,
+            )
+        except Exception as e:
+            # Drop the stored row so the description is not blocked by a reminder that will never fire
+            remove_reminder(self.agent_state.id, new_id)
+            results[i] = f"Item {i}: reminder '{item['description']}' could not be scheduled: {e}"
+            continue
+        results[i] = f"Item {i}: reminder '{item['description']}' has been added with ID {new_id}. Next occurrence: {next_occurrence}"
+
+    return "\n".join(results)
+
+
 def delete_reminder(self: Agent, description: Optional[str] = None, reminder_id: Optional[int] = None) -> str:
     """
     Deletes an existing reminder by exact description match or by ID for the current agent.
@@ -150,32 +136,16 @@ def delete_reminder(self: Agent, description: Optional[str] = None, reminder_id:
     if description is None and reminder_id is None:
         return "Please provide either a description or an ID to delete a reminder."
 
-    with shelve.open("reminders.shelve") as db:
-        agent_reminders = [reminder for reminder in db.values() if reminder["agent_id"] == self.agent_state.id]
-        reminder_to_delete = None
+    reminder_to_delete = get_reminder(self.agent_state.id, description=description, reminder_id=reminder_id)
+    if reminder_to_delete is None:
+        return "Reminder not found."
 
-        if description is not None:
-            for reminder in agent_reminders:
-                if reminder["description"] == description:
-                    reminder_to_delete = reminder
-                    break
+    remove_reminder(self.agent_state.id, reminder_to_delete["id"])
 
-        if reminder_id is not None:
-            for reminder in agent_reminders:
-                if reminder["id"] == reminder_id:
-                    reminder_to_delete = reminder
-                    break
+    # Cancel the scheduled execution of the reminder
+    unschedule_reminder(reminder_to_delete["id"])
 
-        if reminder_to_delete is None:
-            return "Reminder not found."
-
-        del db[str(reminder_to_delete["id"])]
-        
-        # Cancel the scheduled execution of the reminder
-        scheduler = get_scheduler()
-        scheduler.remove_job(f"reminder_{reminder_to_delete['id']}")
-        
-        return f"Reminder '{reminder_to_delete['description']}' has been deleted."
+    return f"Reminder '{reminder_to_delete['description']}' has been deleted."
 
 
 def list_reminders(self: Agent, page: Optional[int] = 0) -> str:
@@ -188,30 +158,16 @@ def list_reminders(self: Agent, page: Optional[int] = 0) -> str:
     Returns:
         str: A string listing the reminders or indicating that no reminders were found for the current agent.
     """
-    if page is None or (isinstance(page, str) and page.lower().strip() == "none"):
+    # Fast path for the usual int argument; strings are only normalized when the LLM passes one
+    if page is None:
         page = 0
-    try:
-        page = int(page)
-    except ValueError:
-        raise ValueError(f"'page' argument must be an integer")
-
-    count = 10  # Number of reminders per page
-    with shelve.open("reminders.shelve") as db:
-        agent_reminders = [reminder for reminder in db.values() if reminder["agent_id"] == self.agent_state.id]
-        total = len(agent_reminders)
-        num_pages = math.ceil(total / count)  # Total number of pages
-
-        if total == 0:
-            return "No reminders found."
-
-        start = page * count
-        end = start + count
-        paginated_reminders = agent_reminders[start:end]
-
-        results_pref = f"Showing {len(paginated_reminders)} of {total} reminders (page {page+1}/{num_pages}):"
-        results_formatted = [
-            f"ID: {reminder['id']}, Description: {reminder['description']}, Recurrence Rule: {reminder['recurrence_rule']}, Created At: {reminder['created_at']}, Modified At: {reminder['modified_at']}"
-            for reminder in paginated_reminders
-        ]
-        results_str = f"{results_pref}\n" + "\n".join(results_formatted)
-        return results_str
+    elif not isinstance(page, int):
+        if isinstance(page, str) and page.strip().lower() == "none":
+            page = 0
+        else:
+            try:
+                page = int(page)
+            except ValueError:
+                raise ValueError(f"'page' argument must be an integer")
+
+    return get_reminders_page(self.agent_state.id, page)
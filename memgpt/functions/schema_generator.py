@@ -51,6 +51,7 @@ def type_to_json_schema_type(py_type):
         bool: "boolean",
         float: "number",
         list[str]: "array",
+        list[dict]: "array",
         # Add more mappings as needed
     }
     if py_type not in type_map:
@@ -129,6 +130,8 @@ def generate_schema(function):
         if get_origin(param.annotation) is list:
             if get_args(param.annotation)[0] is str:
                 schema["parameters"]["properties"][param.name]["items"] = {"type": "string"}
+            elif get_args(param.annotation)[0] is dict:
+                schema["parameters"]["properties"][param.name]["items"] = {"type": "object"}
 
         if param.annotation == inspect.Parameter.empty:
             schema["parameters"]["required"].append(param.name)
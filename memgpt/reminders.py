@@ -0,0 +1,521 @@
+import asyncio
+import atexit
+import concurrent.futures
+import datetime
+import functools
+import glob
+import logging
+import math
+import os
+import shelve
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import httpx
+import orjson
+from apscheduler.triggers.cron import CronTrigger
+from dateutil.rrule import rrulestr
+
+from memgpt.scheduler import get_scheduler, resume_scheduler
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "http://localhost:8083/api"
+MESSAGES_URL_FMT = f"{BASE_URL}/agents/{{}}/messages"
+MEMGPT_SERVER_PASS = os.environ["MEMGPT_SERVER_PASS"]
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+    "Authorization": f"Bearer {MEMGPT_SERVER_PASS}",
+}
+
+SAO_PAULO_TIMEZONE = ZoneInfo("America/Sao_Paulo")
+
+# Reminder messages are sent from a dedicated event loop, so scheduler threads hand them off and return immediately
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="memgpt-reminders", daemon=True).start()
+
+_client = httpx.AsyncClient(
+    headers=DEFAULT_HEADERS,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    timeout=30,
+)
+
+
+# Message URLs are parsed once per agent, and requests are built directly instead of through the client's build_request,
+# which would re-merge URL, headers, cookies and timeout on every fire
+_message_urls: Dict[str, httpx.URL] = {}
+_request_extensions = {"timeout": _client.timeout.as_dict()}
+
+
+async def send_message(agent_id: str, message: str) -> httpx.Response:
+    """Send a message to an agent through the REST API"""
+    url = _message_urls.get(agent_id)
+    if url is None:
+        url = _message_urls[agent_id] = httpx.URL(MESSAGES_URL_FMT.format(agent_id))
+    payload = {"message": message}
+    logger.debug("Sending message to %s with payload: %s", url, payload)
+    # Content-Type is already set on the client, so the body can be encoded with orjson directly
+    request = httpx.Request("POST", url, headers=_client.headers, content=orjson.dumps(payload), extensions=_request_extensions)
+    response = await _client.send(request)
+    logger.debug("Message sent with response status: %s", response.status_code)
+    return response
+
+
+def _report_failure(future: concurrent.futures.Future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Failed to send reminder message: %s", future.exception())
+
+
+def dispatch_message(agent_id: str, message: str) -> concurrent.futures.Future:
+    """Schedule send_message on the reminders event loop without waiting for the response"""
+    future = asyncio.run_coroutine_threadsafe(send_message(agent_id, message), _loop)
+    future.add_done_callback(_report_failure)
+    return future
+
+
+# Reminders are persisted in SQLite, indexed by agent, with a unique description per agent
+_conn = sqlite3.connect("reminders.db", check_same_thread=False, isolation_level=None)
+_conn.row_factory = sqlite3.Row
+_conn.execute("PRAGMA journal_mode=WAL")
+_conn.execute("PRAGMA synchronous=NORMAL")
+_conn.executescript(
+    """
+    CREATE TABLE IF NOT EXISTS reminders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        agent_id TEXT NOT NULL,
+        description TEXT NOT NULL,
+        recurrence_rule TEXT,
+        created_at TEXT NOT NULL,
+        modified_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS reminders_agent_id ON reminders (agent_id);
+    CREATE UNIQUE INDEX IF NOT EXISTS reminders_agent_id_description ON reminders (agent_id, description);
+    """
+)
+_db_lock = threading.Lock()
+
+
+def _import_shelve(path: str = "reminders.shelve"):
+    # Reminders used to live in a shelve keyed by per-agent IDs. They are copied over once, the first time the table is
+    # opened (sqlite_sequence has no row until AUTOINCREMENT hands out an ID), and get new global IDs in creation order
+    if not glob.glob(f"{glob.escape(path)}*"):
+        return
+    if _conn.execute("SELECT 1 FROM sqlite_sequence WHERE name = 'reminders'").fetchone() is not None:
+        return
+    with shelve.open(path, flag="r") as db:
+        old_reminders = sorted(db.values(), key=lambda reminder: (reminder["created_at"], reminder["id"]))
+
+    # Only recurring reminders that will still fire are kept: one-off jobs lived in the old in-memory scheduler and are
+    # gone, and the old store could hold rules that never parsed
+    current_time = datetime.datetime.now(SAO_PAULO_TIMEZONE)
+    valid_reminders = []
+    for reminder in old_reminders:
+        try:
+            if not reminder["recurrence_rule"]:
+                raise ValueError("one-off reminder whose job is gone")
+            rule = rrulestr(reminder["recurrence_rule"], dtstart=datetime.datetime.fromisoformat(reminder["created_at"]))
+            if rule.after(current_time) is None:
+                raise ValueError("no upcoming occurrence")
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning("Skipping reminder ID %s (%s) from %s: %s", reminder["id"], reminder["description"], path, e)
+            continue
+        valid_reminders.append(reminder)
+
+    _conn.execute("BEGIN")
+    try:
+        _conn.executemany(
+            "INSERT INTO reminders (agent_id, description, recurrence_rule, created_at, modified_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (agent_id, description) DO NOTHING",
+            [
+                (reminder["agent_id"], reminder["description"], reminder["recurrence_rule"], reminder["created_at"], reminder["modified_at"])
+                for reminder in valid_reminders
+            ],
+        )
+        _conn.execute("COMMIT")
+    except Exception:
+        _conn.execute("ROLLBACK")
+        raise
+    logger.info("Imported %s of %s reminders from %s", len(valid_reminders), len(old_reminders), path)
+
+
+_import_shelve()
+
+# All reads are served from this in-memory copy, keyed by agent_id then reminder ID and loaded once at import;
+# writes go to SQLite first and then update it
+_by_agent: Dict[str, Dict[int, dict]] = {}
+
+
+def _render(reminder: dict) -> str:
+    # Reminders are never modified, so each one is formatted for list_reminders only once and kept under "_rendered"
+    return f"ID: {reminder['id']}, Description: {reminder['description']}, Recurrence Rule: {reminder['recurrence_rule']}, Created At: {reminder['created_at']}, Modified At: {reminder['modified_at']}"
+
+
+for _row in _conn.execute("SELECT * FROM reminders ORDER BY id"):
+    _reminder = dict(_row)
+    _reminder["_rendered"] = _render(_reminder)
+    _by_agent.setdefault(_reminder["agent_id"], {})[_reminder["id"]] = _reminder
+
+REMINDERS_PAGE_SIZE = 10
+LIST_CACHE_TTL = 10  # seconds
+
+# Rendered list_reminders pages per agent: (rendered_at, total, {page: text}), dropped whenever the agent's reminders change
+_list_cache: Dict[str, Tuple[float, int, Dict[int, str]]] = {}
+
+
+def _insert(agent_id: str, description: str, recurrence_rule: Optional[str], created_at: str) -> Optional[int]:
+    # Callers must hold _db_lock. The unique (agent_id, description) index turns duplicates into a no-op with no returned row
+    row = _conn.execute(
+        "INSERT INTO reminders (agent_id, description, recurrence_rule, created_at, modified_at) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (agent_id, description) DO NOTHING RETURNING id",
+        (agent_id, description, recurrence_rule, created_at, created_at),
+    ).fetchone()
+    if row is None:
+        return None
+    reminder = {
+        "id": row["id"],
+        "agent_id": agent_id,
+        "description": description,
+        "recurrence_rule": recurrence_rule,
+        "created_at": created_at,
+        "modified_at": created_at,
+    }
+    reminder["_rendered"] = _render(reminder)
+    _by_agent.setdefault(agent_id, {})[row["id"]] = reminder
+    return row["id"]
+
+
+def _find_by_description(agent_id: str, description: str) -> Optional[dict]:
+    # Callers must hold _db_lock
+    for reminder in _by_agent.get(agent_id, {}).values():
+        if reminder["description"] == description:
+            return reminder
+    return None
+
+
+def add_reminder(agent_id: str, description: str, recurrence_rule: Optional[str], created_at: str) -> Optional[int]:
+    """Insert a reminder and return its newly assigned ID, or None if the agent already has one with this description"""
+    with _db_lock:
+        new_id = _insert(agent_id, description, recurrence_rule, created_at)
+    if new_id is not None:
+        _list_cache.pop(agent_id, None)
+    return new_id
+
+
+def add_reminders(agent_id: str, reminders: List[Tuple[str, Optional[str]]], created_at: str) -> List[Optional[int]]:
+    """Insert (description, recurrence_rule) pairs in one transaction, returning the new IDs in input order (None for duplicates)"""
+    new_ids = []
+    with _db_lock:
+        _conn.execute("BEGIN")
+        try:
+            for description, recurrence_rule in reminders:
+                new_ids.append(_insert(agent_id, description, recurrence_rule, created_at))
+            _conn.execute("COMMIT")
+        except Exception:
+            _conn.execute("ROLLBACK")
+            for new_id in new_ids:
+                if new_id is not None:
+                    _by_agent[agent_id].pop(new_id, None)
+            raise
+    _list_cache.pop(agent_id, None)
+    return new_ids
+
+
+def get_reminder(agent_id: str, description: Optional[str] = None, reminder_id: Optional[int] = None) -> Optional[dict]:
+    """Look up one of the agent's reminders by ID or by exact description (the ID wins if both match)"""
+    with _db_lock:
+        reminder = None
+        if reminder_id is not None:
+            reminder = _by_agent.get(agent_id, {}).get(reminder_id)
+        if reminder is None and description is not None:
+            reminder = _find_by_description(agent_id, description)
+    return dict(reminder) if reminder is not None else None
+
+
+def remove_reminder(agent_id: str, reminder_id: int) -> bool:
+    with _db_lock:
+        agent_reminders = _by_agent.get(agent_id, {})
+        if reminder_id not in agent_reminders:
+            return False
+        _conn.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+        del agent_reminders[reminder_id]
+    _list_cache.pop(agent_id, None)
+    return True
+
+
+def _render_pages(agent_id: str) -> Tuple[int, Dict[int, str]]:
+    with _db_lock:
+        reminders = list(_by_agent.get(agent_id, {}).values())
+    total = len(reminders)
+    num_pages = math.ceil(total / REMINDERS_PAGE_SIZE)  # Total number of pages
+
+    pages = {}
+    for page in range(num_pages):
+        paginated_reminders = reminders[page * REMINDERS_PAGE_SIZE : (page + 1) * REMINDERS_PAGE_SIZE]
+        results_pref = f"Showing {len(paginated_reminders)} of {total} reminders (page {page+1}/{num_pages}):"
+        pages[page] = f"{results_pref}\n" + "\n".join(reminder["_rendered"] for reminder in paginated_reminders)
+    return total, pages
+
+
+def get_reminders_page(agent_id: str, page: int) -> str:
+    """Return one rendered page of the agent's reminders, rebuilding all pages at most once per LIST_CACHE_TTL"""
+    cached = _list_cache.get(agent_id)
+    if cached is None or time.monotonic() - cached[0] > LIST_CACHE_TTL:
+        cached = (time.monotonic(), *_render_pages(agent_id))
+        _list_cache[agent_id] = cached
+    _, total, pages = cached
+
+    if total == 0:
+        return "No reminders found."
+    if page not in pages:
+        return f"Showing 0 of {total} reminders (page {page+1}/{len(pages)}):\n"
+    return pages[page]
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_rrule(recurrence_rule: str, dtstart_iso: str):
+    # rrulestr is a full parser; rescheduling the same reminder reuses the compiled rule
+    return rrulestr(recurrence_rule, dtstart=datetime.datetime.fromisoformat(dtstart_iso))
+
+
+_CRON_WEEKDAYS = {"MO": "mon", "TU": "tue", "WE": "wed", "TH": "thu", "FR": "fri", "SA": "sat", "SU": "sun"}
+_CRON_ORDINALS = {"1": "1st", "2": "2nd", "3": "3rd", "4": "4th", "5": "5th", "-1": "last"}
+
+
+def _rrule_to_cron(recurrence_rule: str) -> Optional[CronTrigger]:
+    """Translate an open-ended DAILY/WEEKLY/MONTHLY rule with an explicit time of day into a CronTrigger, or None if it has no cron equivalent"""
+    try:
+        parts = dict(part.split("=", 1) for part in recurrence_rule.upper().removeprefix("RRULE:").split(";") if part)
+    except ValueError:
+        return None
+    # COUNT, UNTIL, BYSETPOS etc. cannot be expressed in cron, and any missing BYHOUR/BYMINUTE/BYSECOND would come from dtstart
+    if not set(parts) <= {"FREQ", "INTERVAL", "WKST", "BYHOUR", "BYMINUTE", "BYSECOND", "BYDAY", "BYMONTHDAY", "BYMONTH"}:
+        return None
+    if parts.get("INTERVAL", "1") != "1" or not {"BYHOUR", "BYMINUTE", "BYSECOND"} <= set(parts):
+        return None
+
+    fields = {"hour": parts["BYHOUR"], "minute": parts["BYMINUTE"], "second": parts["BYSECOND"]}
+    if "BYMONTH" in parts:
+        fields["month"] = parts["BYMONTH"]
+
+    freq = parts.get("FREQ")
+    if freq in ("DAILY", "WEEKLY"):
+        if "BYMONTHDAY" in parts:
+            return None
+        if "BYDAY" in parts:
+            if any(day not in _CRON_WEEKDAYS for day in parts["BYDAY"].split(",")):
+                return None
+            fields["day_of_week"] = ",".join(_CRON_WEEKDAYS[day] for day in parts["BYDAY"].split(","))
+        elif freq == "WEEKLY":
+            return None
+    elif freq == "MONTHLY":
+        if "BYMONTHDAY" in parts and "BYDAY" not in parts:
+            fields["day"] = parts["BYMONTHDAY"]
+        elif "BYDAY" in parts and "BYMONTHDAY" not in parts:
+            # Ordinal weekdays such as +4TH or -1FR
+            days = []
+            for day in parts["BYDAY"].split(","):
+                ordinal, weekday = day[:-2].lstrip("+"), day[-2:]
+                if weekday not in _CRON_WEEKDAYS or ordinal not in _CRON_ORDINALS:
+                    return None
+                days.append(f"{_CRON_ORDINALS[ordinal]} {_CRON_WEEKDAYS[weekday]}")
+            fields["day"] = ",".join(days)
+        else:
+            return None
+    else:
+        return None
+
+    try:
+        return CronTrigger(timezone=SAO_PAULO_TIMEZONE, **fields)
+    except ValueError:
+        return None
+
+
+def execute_reminder(agent_id: str, reminder_id: int, description: str, recurrence_rule: Optional[str], dtstart_iso: str):
+    """Scheduler job that delivers a reminder to its agent and, for recurring reminders, schedules the next occurrence"""
+    # Same "YYYY-MM-DD HH:MM:SS" text as strftime, without going through its format-string interpreter
+    current_time_str = datetime.datetime.now(SAO_PAULO_TIMEZONE).replace(tzinfo=None).isoformat(sep=" ", timespec="seconds")
+    message = f"> SYS: It is {current_time_str}, remind the user about his scheduled reminder: '{description}'"
+    logger.debug("Executing reminder ID %s at %s", reminder_id, current_time_str)
+    dispatch_message(agent_id, message)
+
+    # Schedule the next occurrence if there is a recurrence rule
+    if recurrence_rule:
+        rule = _compile_rrule(recurrence_rule, dtstart_iso)
+        next_occurrence = rule.after(datetime.datetime.now(SAO_PAULO_TIMEZONE))
+        if next_occurrence:
+            logger.debug("Scheduling next occurrence for reminder ID %s at %s", reminder_id, next_occurrence)
+            _scheduler.add_job(
+                execute_reminder,
+                "date",
+                run_date=next_occurrence,
+                args=(agent_id, reminder_id, description, recurrence_rule, dtstart_iso),
+                id=f"reminder_{reminder_id}",
+                replace_existing=True,
+            )
+        else:
+            # If there is no next occurrence, delete the reminder from the database
+            if remove_reminder(agent_id, reminder_id):
+                logger.debug("Reminder ID %s deleted from the database as there are no more occurrences.", reminder_id)
+
+
+def _plan(
+    recurrence_rule: Optional[str],
+    timestamp: Optional[str],
+    delay_minutes: Optional[int],
+    current_time: datetime.datetime,
+    dtstart_iso: str,
+) -> Tuple[datetime.datetime, Optional[CronTrigger]]:
+    # Returns the next occurrence and, when the rule maps to one, the cron trigger that repeats it. Raises ValueError on bad input
+    if recurrence_rule:
+        if not isinstance(recurrence_rule, str):
+            raise ValueError(f"invalid recurrence_rule {recurrence_rule!r}, expected a string")
+        cron_trigger = _rrule_to_cron(recurrence_rule)
+        if cron_trigger is not None:
+            return cron_trigger.get_next_fire_time(None, current_time), cron_trigger
+        try:
+            rule = _compile_rrule(recurrence_rule, dtstart_iso)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"invalid recurrence_rule '{recurrence_rule}': {e}") from e
+        next_occurrence = rule.after(current_time)
+        if next_occurrence is None:
+            raise ValueError(f"recurrence_rule '{recurrence_rule}' has no upcoming occurrence")
+    elif timestamp:
+        try:
+            next_occurrence = datetime.datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").replace(tzinfo=SAO_PAULO_TIMEZONE)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"invalid timestamp '{timestamp}', expected YYYY-MM-DD HH:mm:ss") from e
+    elif delay_minutes:
+        # The LLM sometimes passes numbers as strings
+        try:
+            delay_minutes = int(delay_minutes)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"invalid delay_minutes '{delay_minutes}', expected an integer") from e
+        next_occurrence = current_time + datetime.timedelta(minutes=delay_minutes)
+    else:
+        raise ValueError("Either recurrence_rule, timestamp or delay_minutes must be provided")
+    return next_occurrence, None
+
+
+def get_next_occurrence(
+    recurrence_rule: Optional[str],
+    timestamp: Optional[str],
+    delay_minutes: Optional[int],
+    current_time: datetime.datetime,
+) -> datetime.datetime:
+    """Validate a reminder's timing without scheduling it, returning when it would first fire (raises ValueError if it never would)"""
+    return _plan(recurrence_rule, timestamp, delay_minutes, current_time, current_time.isoformat())[0]
+
+
+def schedule_reminder(
+    agent_id: str,
+    reminder_id: int,
+    description: str,
+    recurrence_rule: Optional[str],
+    timestamp: Optional[str],
+    delay_minutes: Optional[int],
+    current_time: datetime.datetime,
+    dtstart: Optional[datetime.datetime] = None,
+) -> datetime.datetime:
+    """Add the scheduler job that fires a stored reminder, returning its next occurrence (recurrence rules start at dtstart, defaulting to current_time)"""
+    logger.debug("Scheduling reminder with ID %s and description '%s'", reminder_id, description)
+    dtstart_iso = (dtstart or current_time).isoformat()
+    next_occurrence, cron_trigger = _plan(recurrence_rule, timestamp, delay_minutes, current_time, dtstart_iso)
+    logger.debug("Next occurrence calculated: %s", next_occurrence)
+
+    if cron_trigger is not None:
+        # The scheduler repeats the job by itself, so execute_reminder gets no rule to chain the next occurrence from
+        _scheduler.add_job(
+            execute_reminder,
+            cron_trigger,
+            args=(agent_id, reminder_id, description, None, dtstart_iso),
+            id=f"reminder_{reminder_id}",
+        )
+        return next_occurrence
+
+    # Jobs are persisted by the scheduler, so the callable is a module-level function and its state travels in args
+    _scheduler.add_job(
+        execute_reminder,
+        "date",
+        run_date=next_occurrence,
+        args=(agent_id, reminder_id, description, recurrence_rule, dtstart_iso),
+        id=f"reminder_{reminder_id}",
+    )
+    return next_occurrence
+
+
+def unschedule_reminder(reminder_id: int):
+    """Cancel the scheduled execution of a reminder"""
+    _scheduler.remove_job(f"reminder_{reminder_id}")
+
+
+def _reschedule(reminder: dict, current_time: datetime.datetime):
+    try:
+        rule = _compile_rrule(reminder["recurrence_rule"], reminder["created_at"])
+        if rule.after(current_time) is None:
+            remove_reminder(reminder["agent_id"], reminder["id"])
+            return
+        schedule_reminder(
+            reminder["agent_id"],
+            reminder["id"],
+            reminder["description"],
+            reminder["recurrence_rule"],
+            None,
+            None,
+            current_time,
+            dtstart=datetime.datetime.fromisoformat(reminder["created_at"]),
+        )
+    except (ValueError, TypeError):
+        # A stored rule that cannot be parsed will never fire, so the row is dropped instead of blocking its description
+        logger.exception("Removing reminder ID %s with unusable recurrence rule '%s'", reminder["id"], reminder["recurrence_rule"])
+        remove_reminder(reminder["agent_id"], reminder["id"])
+    except Exception:
+        # Anything else (e.g. a job store error) may be transient, so the row is kept for the next startup
+        logger.exception("Could not reschedule reminder ID %s", reminder["id"])
+
+
+def reschedule_all():
+    """Re-register recurring reminders that have no scheduler job, e.g. after the job store was lost"""
+    scheduled = {job.id for job in _scheduler.get_jobs()}
+    with _db_lock:
+        reminders = [
+            reminder
+            for agent_reminders in _by_agent.values()
+            for reminder in agent_reminders.values()
+            if reminder["recurrence_rule"] and f"reminder_{reminder['id']}" not in scheduled
+        ]
+    if not reminders:
+        return
+
+    # One-off reminders only store their description, so only recurring ones can be rebuilt
+    current_time = datetime.datetime.now(SAO_PAULO_TIMEZONE)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda reminder: _reschedule(reminder, current_time), reminders))
+    logger.debug("Rescheduled %s reminders", len(reminders))
+
+
+def start_reminders():
+    """Restore missing reminder jobs, then start running them in this process"""
+    # Runs while the scheduler is still paused, so its thread is not holding the job store while this one reads it
+    # One bad reminder must not keep every other one paused
+    try:
+        reschedule_all()
+    finally:
+        resume_scheduler()
+
+
+def _shutdown():
+    try:
+        asyncio.run_coroutine_threadsafe(_client.aclose(), _loop).result(timeout=5)
+    finally:
+        _loop.call_soon_threadsafe(_loop.stop)
+
+
+atexit.register(_shutdown)
+
+# The scheduler comes up paused; only the REST server starts running jobs, through start_reminders after startup
+_scheduler = get_scheduler()
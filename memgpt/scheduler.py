@@ -1,8 +1,54 @@
+import threading
+from typing import Optional
+
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
 
-def get_scheduler():
+scheduler: Optional[BackgroundScheduler] = None
+_lock = threading.Lock()
+
+# How often the running scheduler re-reads the shared job store; well under misfire_grace_time so jobs stored by
+# other processes are not skipped as misfired
+JOB_STORE_POLL_SECONDS = 10
+
+
+def get_scheduler() -> BackgroundScheduler:
     global scheduler
-    if 'scheduler' not in globals():
-        scheduler = BackgroundScheduler()
-        scheduler.start()
+    if scheduler is None:
+        with _lock:
+            # Checked again under the lock so concurrent callers cannot start two schedulers
+            if scheduler is None:
+                # Jobs are persisted so they survive restarts, and enough workers are kept around for bursts of reminders firing together
+                scheduler = BackgroundScheduler(
+                    jobstores={"default": SQLAlchemyJobStore(url="sqlite:///jobs.sqlite"), "local": MemoryJobStore()},
+                    executors={"default": ThreadPoolExecutor(32)},
+                    job_defaults={"coalesce": True, "misfire_grace_time": 60},
+                )
+                # Every process that loads the reminders function set gets a scheduler, but APScheduler cannot share a persistent
+                # job store between running schedulers, so it starts paused: jobs are only stored, and just the process that
+                # calls resume_scheduler (the REST server) runs them
+                scheduler.start(paused=True)
     return scheduler
+
+
+def _poll_job_store():
+    # Does nothing: the scheduler checks every job store for due jobs each time it wakes up to run this
+    pass
+
+
+def resume_scheduler():
+    """Start running scheduled jobs in this process"""
+    scheduler = get_scheduler()
+    # The scheduler otherwise sleeps until the next job it knows about, or indefinitely if it knows none, so it would
+    # never see jobs added to jobs.sqlite by other processes; this process-local job bounds the wait
+    scheduler.add_job(
+        _poll_job_store,
+        "interval",
+        seconds=JOB_STORE_POLL_SECONDS,
+        id="poll_job_store",
+        jobstore="local",
+        replace_existing=True,
+    )
+    scheduler.resume()
@@ -136,6 +136,12 @@ def on_startup():
         print(f"Writing out openapi_assistants.json file")
         json.dump(openai_assistants_api, file, indent=2)
 
+    # Reminders are delivered back through this API with the server password, so only the server runs their jobs
+    if settings.server_pass:
+        from memgpt.reminders import start_reminders
+
+        start_reminders()
+
 
 @app.on_event("shutdown")
 def on_shutdown():
@@ -0,0 +1,163 @@
+import datetime
+import os
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from dateutil.rrule import rrulestr
+
+# memgpt.reminders reads the server password and opens reminders.db / jobs.sqlite in the working directory on import
+os.environ.setdefault("MEMGPT_SERVER_PASS", "test")
+
+
+@pytest.fixture(scope="module")
+def reminders(tmp_path_factory):
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("reminders"))
+    try:
+        import memgpt.functions.function_sets.reminders as reminder_functions
+
+        yield reminder_functions
+    finally:
+        os.chdir(cwd)
+
+
+def make_agent():
+    return SimpleNamespace(agent_state=SimpleNamespace(id=str(uuid.uuid4())))
+
+
+def test_create_reminders_batch_rejects_bad_items_before_storing(reminders):
+    from memgpt.reminders import get_reminder
+    from memgpt.scheduler import get_scheduler
+
+    agent = make_agent()
+    items = [
+        {"description": "valid delay", "delay_minutes": 30},
+        {"description": "bad timestamp", "timestamp": "tomorrow at noon"},
+        {"description": "string delay", "delay_minutes": "15"},
+        {"description": "bad delay", "delay_minutes": "soon"},
+        {"description": "bad rule", "recurrence_rule": "FREQ=SOMETIMES"},
+        {"description": "valid rule", "recurrence_rule": "FREQ=DAILY;BYHOUR=9;BYMINUTE=0;BYSECOND=0"},
+        {"description": "no timing"},
+    ]
+    lines = reminders.create_reminders_batch(agent, items).split("\n")
+    assert len(lines) == len(items)
+
+    for i, item in enumerate(items):
+        reminder = get_reminder(agent.agent_state.id, description=item["description"])
+        if item["description"] in ("valid delay", "string delay", "valid rule"):
+            assert "has been added" in lines[i]
+            assert reminder is not None
+            assert get_scheduler().get_job(f"reminder_{reminder['id']}") is not None
+        else:
+            assert lines[i].startswith(f"Item {i}: ")
+            assert "has been added" not in lines[i]
+            assert reminder is None
+
+    # The rejected descriptions are not blocked for a corrected retry
+    lines = reminders.create_reminders_batch(agent, [{"description": "bad timestamp", "timestamp": "2099-01-01 12:00:00"}]).split("\n")
+    assert "has been added" in lines[0]
+
+
+def test_create_reminders_batch_removes_rows_that_fail_to_schedule(reminders, monkeypatch):
+    from memgpt.reminders import get_reminder, schedule_reminder
+
+    def failing_schedule_reminder(agent_id, reminder_id, description, *args, **kwargs):
+        if description == "fails":
+            raise RuntimeError("job store unavailable")
+        return schedule_reminder(agent_id, reminder_id, description, *args, **kwargs)
+
+    monkeypatch.setattr(reminders, "schedule_reminder", failing_schedule_reminder)
+
+    agent = make_agent()
+    lines = reminders.create_reminders_batch(
+        agent,
+        [{"description": "fails", "delay_minutes": 5}, {"description": "works", "delay_minutes": 5}],
+    ).split("\n")
+
+    assert "could not be scheduled: job store unavailable" in lines[0]
+    assert get_reminder(agent.agent_state.id, description="fails") is None
+    assert "has been added" in lines[1]
+    assert get_reminder(agent.agent_state.id, description="works") is not None
+
+
+
+def test_create_reminder_removes_row_that_fails_to_schedule(reminders, monkeypatch):
+    from memgpt.reminders import get_reminder
+
+    def failing_schedule_reminder(*args, **kwargs):
+        raise RuntimeError("job store unavailable")
+
+    monkeypatch.setattr(reminders, "schedule_reminder", failing_schedule_reminder)
+
+    agent = make_agent()
+    result = reminders.create_reminder(agent, "fails", delay_minutes=5)
+
+    assert "could not be scheduled: job store unavailable" in result
+    assert get_reminder(agent.agent_state.id, description="fails") is None
+
+
+@pytest.mark.parametrize(
+    "recurrence_rule",
+    [
+        "FREQ=DAILY;BYHOUR=21;BYMINUTE=30;BYSECOND=0",
+        "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR;BYHOUR=21;BYMINUTE=0;BYSECOND=0",
+        "FREQ=MONTHLY;BYDAY=+4TH;BYHOUR=19;BYMINUTE=30;BYSECOND=0",
+        "FREQ=MONTHLY;BYDAY=-1FR;BYHOUR=8;BYMINUTE=15;BYSECOND=0",
+        "FREQ=MONTHLY;BYMONTHDAY=10;BYHOUR=12;BYMINUTE=0;BYSECOND=0",
+    ],
+)
+def test_rrule_to_cron_matches_rrule(reminders, recurrence_rule):
+    from memgpt.reminders import SAO_PAULO_TIMEZONE, _rrule_to_cron
+
+    cron_trigger = _rrule_to_cron(recurrence_rule)
+    assert cron_trigger is not None
+
+    current_time = datetime.datetime(2024, 1, 31, 12, 0, tzinfo=SAO_PAULO_TIMEZONE)
+    rule = rrulestr(recurrence_rule, dtstart=current_time)
+    for _ in range(24):
+        expected = rule.after(current_time)
+        # get_next_fire_time includes its start time while rrule.after does not
+        actual = cron_trigger.get_next_fire_time(None, current_time + datetime.timedelta(microseconds=1))
+        assert actual == expected
+        current_time = expected
+
+
+@pytest.mark.parametrize(
+    "recurrence_rule",
+    [
+        "FREQ=DAILY;COUNT=1;BYHOUR=17;BYMINUTE=35;BYSECOND=0",
+        "FREQ=DAILY;UNTIL=20300101T000000Z;BYHOUR=17;BYMINUTE=35;BYSECOND=0",
+        "FREQ=DAILY;INTERVAL=2;BYHOUR=17;BYMINUTE=35;BYSECOND=0",
+        "FREQ=WEEKLY;BYHOUR=17;BYMINUTE=35;BYSECOND=0",
+        "FREQ=DAILY;BYHOUR=17;BYMINUTE=35",
+    ],
+)
+def test_rrule_to_cron_rejects_rules_without_cron_equivalent(reminders, recurrence_rule):
+    from memgpt.reminders import _rrule_to_cron
+
+    assert _rrule_to_cron(recurrence_rule) is None
+
+
+def test_start_reminders_skips_unusable_rules(reminders):
+    from apscheduler.schedulers.base import STATE_RUNNING
+
+    from memgpt.reminders import SAO_PAULO_TIMEZONE, add_reminder, get_reminder, start_reminders
+    from memgpt.scheduler import get_scheduler
+
+    # Rows written before rules were validated, e.g. by the old shelve store
+    agent_id = make_agent().agent_state.id
+    created_at = datetime.datetime.now(SAO_PAULO_TIMEZONE).isoformat()
+    bad_id = add_reminder(agent_id, "bad rule", "FREQ=SOMETIMES", created_at)
+    good_id = add_reminder(agent_id, "good rule", "FREQ=DAILY;BYHOUR=9;BYMINUTE=0;BYSECOND=0", created_at)
+
+    scheduler = get_scheduler()
+    try:
+        start_reminders()
+        assert scheduler.state == STATE_RUNNING
+    finally:
+        scheduler.pause()
+
+    assert get_reminder(agent_id, reminder_id=bad_id) is None
+    assert get_reminder(agent_id, reminder_id=good_id) is not None
+    assert scheduler.get_job(f"reminder_{good_id}") is not None
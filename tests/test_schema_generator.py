@@ -107,3 +107,27 @@ def test_schema_generator_with_old_function_set():
             print(f"\n\nreference_schema={real_schema}")
             print(f"\n\ngenerated_schema={generated_schema}")
             assert real_schema == generated_schema
+
+
+def create_items(self, items: list[dict]):
+    """
+    Creates several items at once.
+
+    Args:
+        items (list[dict]): The items to create.
+
+    Returns:
+        str: The IDs of the created items.
+    """
+    return None
+
+
+def test_schema_generator_list_of_dicts():
+    # Check that a list of objects maps to a JSON array of objects
+    generated_schema = generate_schema(create_items)
+    assert generated_schema["parameters"]["properties"]["items"] == {
+        "type": "array",
+        "description": "The items to create.",
+        "items": {"type": "object"},
+    }
+    assert "items" in generated_schema["parameters"]["required"]